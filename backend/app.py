@@ -1,45 +1,75 @@
 # backend/app.py
 import os
-import tempfile
+import io
 import json
 import time
-import threading
+import copy
+import asyncio
+import weakref
+from functools import lru_cache
 from typing import Optional
 import uuid
 
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Body
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 # OpenAI
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 # Whisper
 from faster_whisper import WhisperModel
 
-# TTS (optional)
-import pyttsx3
+# Redis (optional; sessions fall back to in-process storage without it)
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
 
 # --- IMPORT CONFIG ---
 from config import OPENAI_API_KEY, OPENAI_MODEL, OPENAI_TEMPERATURE, WHISPER_SIZE, WHISPER_DEVICE
 
+# Optional tuning knobs (fallback defaults if absent from config.py)
+try:
+    from config import WHISPER_BEAM_SIZE
+except ImportError:
+    # Greedy decoding: ~2x faster than beam_size=5 on short answers with
+    # negligible accuracy loss. Set WHISPER_BEAM_SIZE=5 in config.py to roll back.
+    WHISPER_BEAM_SIZE = 1
+
+try:
+    from config import WHISPER_COMPUTE_TYPE
+except ImportError:
+    # int8 quantization: ~25-40% faster on CPU and half the memory with
+    # near-identical WER; int8_float16 is the GPU equivalent.
+    WHISPER_COMPUTE_TYPE = "int8" if WHISPER_DEVICE == "cpu" else "int8_float16"
+
+try:
+    from config import REDIS_URL
+except ImportError:
+    # e.g. "redis://localhost:6379/0"; unset -> in-process session storage
+    REDIS_URL = os.environ.get("REDIS_URL")
+
 # --- IMPORT INTERVIEW BRAIN LOGIC (RAG-enabled) ---
 from interview_brain import (
     build_rag_index,
     build_rag_index_from_file,
+    embed_query,
     query_rag,
     generate_system_prompt,
-    parse_llm_two_line_response,
+    parse_llm_json_response,
     compute_confidence_score,
     detect_hesitation,
     choose_fallback_followup,
     build_transcript,
+    semantic_cache_lookup,
+    semantic_cache_store,
 )
 
 # ---------------------------------------
 
-# Initialize OpenAI client
-openai_client = OpenAI(api_key=OPENAI_API_KEY)
+# Initialize OpenAI client (async so LLM calls never block the event loop)
+openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
 
 app = FastAPI()
 
@@ -51,49 +81,153 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize Whisper model once
-whisper_model = WhisperModel(WHISPER_SIZE, device=WHISPER_DEVICE)
-
-# Initialize simple TTS engine
-engine = pyttsx3.init()
+# Initialize Whisper model once.
+# Cap OMP threads before ctranslate2 spins up its pools so the BLAS/OpenMP
+# layers don't oversubscribe the cores the thread-pool workers already use.
+os.environ.setdefault("OMP_NUM_THREADS", str(min(os.cpu_count() or 1, 8)))
+whisper_model = WhisperModel(
+    WHISPER_SIZE,
+    device=WHISPER_DEVICE,
+    compute_type=WHISPER_COMPUTE_TYPE,
+    cpu_threads=min(os.cpu_count() or 1, 8),
+    num_workers=2
+)
 
 # ----------------------------
-# SESSION MANAGEMENT (IN-MEMORY)
+# SESSION MANAGEMENT (Redis-backed, in-process fallback)
 # ----------------------------
 class InterviewSession(dict):
-    """Lightweight session container.""" 
+    """Lightweight session container."""
     pass
 
-SESSIONS = {}
+SESSION_TTL_SECONDS = 3600
+
+
+class InMemorySessionStore:
+    """
+    Process-local store used when Redis is not configured.
+    Fine for single-worker dev runs; sessions are lost on restart and
+    never expire, so use Redis for anything multi-worker or long-lived.
+    """
+    def __init__(self):
+        self._sessions = {}
+
+    async def get(self, session_id: str) -> Optional[InterviewSession]:
+        session = self._sessions.get(session_id)
+        # Deep copy so callers get Redis-like snapshot semantics (mutations
+        # only persist through save), not aliases into the stored history list
+        return session if session is None else InterviewSession(copy.deepcopy(session))
+
+    async def save(self, session_id: str, session: InterviewSession) -> None:
+        self._sessions[session_id] = copy.deepcopy(dict(session))
+
+    async def exists(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+
+class RedisSessionStore:
+    """
+    Sessions stored as Redis hashes (key "session:{id}") with JSON-encoded
+    fields and a rolling TTL. This bounds memory (expired interviews are
+    evicted) and lets multiple uvicorn/gunicorn workers share session state.
+    """
+    def __init__(self, url: str):
+        self._redis = aioredis.from_url(url, decode_responses=True)
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"session:{session_id}"
+
+    async def get(self, session_id: str) -> Optional[InterviewSession]:
+        data = await self._redis.hgetall(self._key(session_id))
+        if not data:
+            return None
+        return InterviewSession({k: json.loads(v) for k, v in data.items()})
+
+    async def save(self, session_id: str, session: InterviewSession) -> None:
+        key = self._key(session_id)
+        mapping = {k: json.dumps(v) for k, v in session.items()}
+        pipe = self._redis.pipeline()
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, SESSION_TTL_SECONDS)
+        await pipe.execute()
+
+    async def exists(self, session_id: str) -> bool:
+        return bool(await self._redis.exists(self._key(session_id)))
+
+
+if REDIS_URL and aioredis is not None:
+    session_store = RedisSessionStore(REDIS_URL)
+else:
+    if REDIS_URL and aioredis is None:
+        print("REDIS_URL is set but the redis package is not installed; using in-process sessions.")
+    session_store = InMemorySessionStore()
+
+# Per-session locks serializing read-modify-write of session state under
+# concurrent submissions. WeakValueDictionary lets idle locks be collected;
+# the caller's `async with` holds a strong reference while the lock is live.
+_SESSION_LOCKS: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+def get_session_lock(session_id: str) -> asyncio.Lock:
+    lock = _SESSION_LOCKS.get(session_id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _SESSION_LOCKS[session_id] = lock
+    return lock
 
 # ----------------------------
 # Helper: call OpenAI API (simple wrapper)
 # ----------------------------
-def call_openai_llm(messages, temperature: float = OPENAI_TEMPERATURE, timeout: int = 120) -> str:
+async def call_openai_llm(messages, temperature: float = OPENAI_TEMPERATURE, timeout: int = 120,
+                          stream: bool = False, max_tokens: Optional[int] = None,
+                          response_format: Optional[dict] = None):
     """
     Call OpenAI API with the given messages.
-    Returns the assistant's response content as a string.
+    Returns the assistant's response content as a string, or, when stream=True,
+    an async generator yielding content deltas as they arrive from the API.
+    Pass max_tokens when the expected output is short (e.g. the structured
+    evaluation) so generation can't run long; pass
+    response_format={"type": "json_object"} to force valid JSON output.
     """
     try:
-        response = openai_client.chat.completions.create(
+        kwargs = dict(
             model=OPENAI_MODEL,
             messages=messages,
             temperature=temperature,
-            timeout=timeout
+            timeout=timeout,
+            stream=stream,
+            max_tokens=max_tokens
         )
+        if response_format is not None:
+            kwargs["response_format"] = response_format
+        response = await openai_client.chat.completions.create(**kwargs)
+        if stream:
+            async def _token_iter():
+                async for chunk in response:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        yield delta
+            return _token_iter()
         # Compatibility: if shape differs, handle accordingly
         return response.choices[0].message.content.strip()
     except Exception as e:
         print(f"OpenAI API error: {e}")
         raise HTTPException(status_code=500, detail=f"OpenAI API error: {str(e)}")
 
+
+def sse_frame(payload: dict) -> str:
+    """Serialize a payload dict as a single Server-Sent Events data frame."""
+    return f"data: {json.dumps(payload)}\n\n"
+
 # ----------------------------
 # Utility: compute max questions from mode string
 # ----------------------------
+@lru_cache(maxsize=64)
 def compute_max_questions(mode: str) -> int:
     """
     mode examples: "Quick|10", "Detailed|12", "Long|20"
-    Fallback sensible defaults.
+    Fallback sensible defaults. Cached — the same mode string is re-parsed
+    on every turn of a session.
     """
     if not mode:
         return 12
@@ -115,53 +249,58 @@ def compute_max_questions(mode: str) -> int:
 # ----------------------------
 # Feedback generation helper (unchanged logic, kept strict as before)
 # ----------------------------
-def generate_feedback_for_session(session: InterviewSession) -> str:
-    """
-    Build a concise feedback summary using the full transcript.
-    Returns a string feedback.
-    """
-    transcript = build_transcript(session.get("history", []))
-    # Compose a compact prompt for final feedback
-    prompt = (
-        "You are a senior hiring manager who gives extremely direct, strict, no-sugarcoat feedback. "
-        "Evaluate the transcript honestly and critically, based ONLY on evidence provided.\n\n"
+# The invariant instruction block lives at module level so each call is a
+# single .format, and — since the static prefix precedes the transcript —
+# OpenAI's automatic prompt caching can match it across sessions.
+_FEEDBACK_PROMPT_TEMPLATE = (
+    "You are a senior hiring manager who gives extremely direct, strict, no-sugarcoat feedback. "
+    "Evaluate the transcript honestly and critically, based ONLY on evidence provided.\n\n"
 
-        "Your output MUST follow this exact structure with headings in HTML bold tags:\n\n"
+    "Your output MUST follow this exact structure with headings in HTML bold tags:\n\n"
 
-        "<b>Overall Score</b>\n"
-        "- Give one strict line with a realistic score. Be blunt.\n\n"
+    "<b>Overall Score</b>\n"
+    "- Give one strict line with a realistic score. Be blunt.\n\n"
 
-        "<b>Strengths</b>\n"
-        "- List 2–4 strengths that the candidate genuinely demonstrated.\n\n"
+    "<b>Strengths</b>\n"
+    "- List 2–4 strengths that the candidate genuinely demonstrated.\n\n"
 
-        "<b>Weaknesses</b>\n"
-        "- List 4–6 specific shortcomings. No soft language. No exaggeration.\n\n"
+    "<b>Weaknesses</b>\n"
+    "- List 4–6 specific shortcomings. No soft language. No exaggeration.\n\n"
 
-        "<b>Actionable Recommendations</b>\n"
-        "- Give 3–5 practical improvement steps.\n\n"
+    "<b>Actionable Recommendations</b>\n"
+    "- Give 3–5 practical improvement steps.\n\n"
 
-        "<b>Communication Skills</b>\n"
-        "- Provide a strict 1–2 line assessment.\n\n"
+    "<b>Communication Skills</b>\n"
+    "- Provide a strict 1–2 line assessment.\n\n"
 
-        "<b>Technical Skills</b>\n"
-        "- Provide a strict 1–2 line assessment.\n\n"
+    "<b>Technical Skills</b>\n"
+    "- Provide a strict 1–2 line assessment.\n\n"
 
-        "<b>Areas Needing Immediate Improvement (with improved sample answers)</b>\n"
-        "- Rewrite the weakest points with better sample responses.\n\n"
+    "<b>Areas Needing Immediate Improvement (with improved sample answers)</b>\n"
+    "- Rewrite the weakest points with better sample responses.\n\n"
 
-        "<b>Final Recommendation</b>\n"
-        "- Choose: Hire / No Hire / Maybe, with a short justification.\n\n"
+    "<b>Final Recommendation</b>\n"
+    "- Choose: Hire / No Hire / Maybe, with a short justification.\n\n"
 
-        "STRICT RULES:\n"
-        "- No fluff.\n"
-        "- No praise unless strongly earned.\n"
-        "- No long paragraphs. Use short, sharp statements.\n"
-        "- Do NOT restate the transcript.\n"
-        "- Output strictly in the structured format above.\n\n"
+    "STRICT RULES:\n"
+    "- No fluff.\n"
+    "- No praise unless strongly earned.\n"
+    "- No long paragraphs. Use short, sharp statements.\n"
+    "- Do NOT restate the transcript.\n"
+    "- Output strictly in the structured format above.\n\n"
 
-        f"Transcript:\n{transcript}\n\n"
-        "Now generate the evaluation using the exact HTML-bold structure above."
-    )
+    "Transcript:\n{transcript}\n\n"
+    "Now generate the evaluation using the exact HTML-bold structure above."
+)
+
+
+async def generate_feedback_for_session(session: InterviewSession) -> str:
+    """
+    Build a concise feedback summary using the full transcript.
+    Returns a string feedback.
+    """
+    transcript = build_transcript(session.get("history", []))
+    prompt = _FEEDBACK_PROMPT_TEMPLATE.format(transcript=transcript)
 
     messages = [
         {"role": "system", "content": "You summarize interview transcripts and produce concise feedback."},
@@ -169,12 +308,55 @@ def generate_feedback_for_session(session: InterviewSession) -> str:
     ]
 
     try:
-        fb = call_openai_llm(messages, temperature=0.2, timeout=120)
+        fb = await call_openai_llm(messages, temperature=0.2, timeout=120)
     except Exception as e:
         print("Feedback generation failed:", e)
         fb = "Feedback generation failed. Try again later."
     return fb
 
+
+async def _refresh_history_summary(session_id: str, session: InterviewSession) -> None:
+    """
+    Background task: condense everything but the recent turns into a short
+    summary stored on the session. The system prompt sends this summary plus
+    the recent window, so prompt tokens stay roughly constant however long
+    the interview runs.
+    """
+    older = build_transcript(session.get("history", [])[:-8])
+    if not older:
+        return
+    messages = [
+        {"role": "system", "content": "You condense interview transcripts."},
+        {"role": "user", "content": (
+            "Summarize the following interview exchange in at most 120 words. "
+            "Keep the topics covered and the candidate's strongest and weakest moments:\n\n"
+            + older
+        )}
+    ]
+    try:
+        summary = await call_openai_llm(messages, temperature=0.2, max_tokens=200)
+    except Exception as e:
+        print("History summarization failed:", e)
+        return
+    async with get_session_lock(session_id):
+        latest = await session_store.get(session_id) or session
+        latest["history_summary"] = summary
+        await session_store.save(session_id, latest)
+
+
+async def _gen_and_store_feedback(session_id: str, session: InterviewSession) -> None:
+    """
+    Background task: generate the final feedback and persist it. Clients poll
+    /get_feedback while this runs, so the last turn returns immediately
+    instead of blocking on the feedback round-trip.
+    """
+    feedback_text = await generate_feedback_for_session(session)
+    async with get_session_lock(session_id):
+        latest = await session_store.get(session_id) or session
+        latest["status"] = "finished"
+        latest["feedback"] = feedback_text
+        await session_store.save(session_id, latest)
+
 # ----------------------------
 # Transcription endpoint
 # ----------------------------
@@ -184,20 +366,26 @@ async def transcribe(audio: UploadFile = File(...)):
     Accept audio bytes (wav/webm) and transcribe using faster-whisper.
     """
     content = await audio.read()
-    # Write to temporary wav file
-    suffix = ".wav"
-    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-        tmp.write(content)
-        tmp_path = tmp.name
+    # faster-whisper decodes file-like objects directly (ffmpeg under the
+    # hood), so hand it the bytes in memory — no temp file, no unlink.
+    bio = io.BytesIO(content)
+
+    def _transcribe() -> str:
+        # transcribe() only does the cheap setup; the CPU-heavy decoding runs
+        # lazily as the segment generator is consumed, so the iteration must
+        # happen in this worker thread too or it would block the event loop.
+        # vad_filter skips silence entirely; no cross-segment conditioning is
+        # needed for single short answers.
+        segments, info = whisper_model.transcribe(
+            bio,
+            beam_size=WHISPER_BEAM_SIZE,
+            best_of=1,
+            condition_on_previous_text=False,
+            vad_filter=True
+        )
+        return " ".join(seg.text.strip() for seg in segments if seg.text.strip())
 
-    try:
-        segments, info = whisper_model.transcribe(tmp_path, beam_size=5)
-        text = " ".join([seg.text.strip() for seg in segments if seg.text.strip()])
-    finally:
-        try:
-            os.unlink(tmp_path)
-        except Exception:
-            pass
+    text = await asyncio.to_thread(_transcribe)
 
     return {"text": text}
 
@@ -224,54 +412,59 @@ async def start_session(
     session["mode"] = mode
     session["jd_text"] = jd_text
     session["history"] = []
+    # Incrementally appended transcript mirror of history: O(1) growth per
+    # turn instead of rebuilding the full text every /submit_response
+    session["transcript_str"] = ""
     session["questions_asked"] = 0
     session["status"] = "in_progress"
     session["feedback"] = None
 
-    SESSIONS[session_id] = session
+    await session_store.save(session_id, session)
 
-    # Build RAG index for JD
+    # Build RAG index for JD (embedding + FAISS build are blocking -> worker thread)
     try:
         # If jd_text looks like a local path and exists, build from file, else build from text
         if jd_text and isinstance(jd_text, str) and os.path.exists(jd_text):
-            build_rag_index_from_file(session_id, jd_text)
+            await asyncio.to_thread(build_rag_index_from_file, session_id, jd_text)
         else:
-            build_rag_index(session_id, jd_text)
+            await asyncio.to_thread(build_rag_index, session_id, jd_text)
     except Exception as e:
         print("RAG build error:", e)
         # still continue with empty index
-        build_rag_index(session_id, "")
+        await asyncio.to_thread(build_rag_index, session_id, "")
 
     # Get jd chunks for initial question generation
-    jd_chunks = query_rag(session_id, "initial question generation", top_k=3)
+    jd_chunks, _ = await asyncio.to_thread(query_rag, session_id, "initial question generation", 3)
 
     # Build system prompt and request a single concise question
     system_prompt, _ = generate_system_prompt(role, level, focus, mode, jd_chunks, history_text="", last_user_text="")
     messages = [
         {"role": "system", "content": system_prompt},
-        {"role": "user", "content": "START INTERVIEW. Provide ONLY a single, concise interview question (one sentence) tailored to the JD context above."}
+        {"role": "user", "content": (
+            'START INTERVIEW. Respond with JSON where "followup" is a single, concise interview '
+            'question (one sentence) tailored to the JD context above, "evaluation" is an empty '
+            'string and "offtopic" is false.'
+        )}
     ]
 
     try:
-        first_question = call_openai_llm(messages)
+        raw_first = await call_openai_llm(messages, response_format={"type": "json_object"})
     except Exception as e:
         print("OpenAI start_session error:", e)
         raise HTTPException(status_code=500, detail="Failed to get first question from OpenAI API.")
 
+    _, first_question, _ = parse_llm_json_response(raw_first)
+    first_question = first_question or raw_first.strip()
+
     # Store first interviewer message
     session["history"].append({"speaker": "Interviewer", "text": first_question})
+    session["transcript_str"] += f"\n(Interviewer): {first_question}"
     session["questions_asked"] = 1
     session["current_question"] = first_question
-    SESSIONS[session_id] = session
+    await session_store.save(session_id, session)
 
-    # Non-blocking TTS for the first question
-    def speak(q):
-        try:
-            engine.say(q)
-            engine.runAndWait()
-        except Exception:
-            pass
-    threading.Thread(target=speak, args=(first_question,), daemon=True).start()
+    # TTS happens client-side (Web Speech API in interview.js), so nothing to
+    # synthesize here — the shared pyttsx3 engine used to serialize sessions.
 
     return JSONResponse(content={"session_id": session_id, "first_question": first_question, "status": "in_progress", "current_q_count": session["questions_asked"]})
 
@@ -285,19 +478,25 @@ async def submit_response(
 ):
     """
     Accepts a session_id and a recorded audio file, transcribes it, asks the LLM
-    to evaluate and produce one follow-up question. If the session reaches the
-    max question count, generate and return final feedback instead.
+    to evaluate and produce one follow-up question. The LLM output is streamed
+    back as Server-Sent Events (token frames, then one final JSON frame) so the
+    client sees the evaluation appear token-by-token instead of waiting for the
+    full generation. If the session reaches the max question count, the final
+    frame carries the feedback instead.
     """
-    if session_id not in SESSIONS:
+    session = await session_store.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found.")
-    session = SESSIONS[session_id]
+
+    def single_frame(payload):
+        yield sse_frame({"type": "final", **payload})
 
     # If interview already finished, return feedback immediately if present
     if session.get("status") == "finished":
-        return JSONResponse(content={
+        return StreamingResponse(single_frame({
             "feedback_ready": True,
             "feedback": session.get("feedback", "Feedback is being generated.")
-        })
+        }), media_type="text/event-stream")
 
     # 1) Transcribe audio
     transcription_result = await transcribe(audio)
@@ -305,7 +504,7 @@ async def submit_response(
 
     if not user_text:
         # Ask for repetition (no increment in question count)
-        return JSONResponse(content={
+        return StreamingResponse(single_frame({
             "user_text": "",
             "evaluation": "",
             "followup_question": "I didn't catch that — could you please repeat your answer?",
@@ -316,16 +515,38 @@ async def submit_response(
             "confidence": 0.0,
             "offtopic": False,
             "hesitation_flag": True
-        })
+        }), media_type="text/event-stream")
 
-    # 2) Append user answer to history
+    # 2) Append user answer to the local snapshot (used for prompt building;
+    # the authoritative history is persisted under the session lock below)
     session["history"].append({"speaker": "User", "text": user_text})
-
-    # 3) Retrieve JD chunks (RAG)
-    jd_chunks = query_rag(session_id, user_text, top_k=4)
-
-    # 4) Build LLM system prompt with JD chunks & history; get hesitation flag
-    history_text = build_transcript(session["history"])
+    session["transcript_str"] = session.get("transcript_str", "") + f"\n(User): {user_text}"
+
+    # 3) Embed the answer and probe the per-session semantic cache in
+    # parallel — the two embedding round-trips are independent, so gather
+    # hides one behind the other. The answer vector is reused for retrieval
+    # and confidence scoring (one API call per turn); a cache hit on the
+    # (question, answer) pair skips the LLM entirely.
+    cache_key = f"{session.get('current_question', '')}\n{user_text}"
+    user_vec, (cache_vec, cached_payload) = await asyncio.gather(
+        asyncio.to_thread(embed_query, user_text),
+        asyncio.to_thread(semantic_cache_lookup, session_id, cache_key),
+    )
+    jd_chunks, jd_chunk_ids = await asyncio.to_thread(query_rag, session_id, user_text, 3, user_vec)
+    # Guard against oversized chunks inflating the prompt (prefill cost is
+    # quadratic in tokens); 200 words comfortably covers our 150-word chunks
+    jd_chunks = [" ".join(c.split()[:200]) for c in jd_chunks]
+
+    # 4) Build LLM system prompt with JD chunks & history; get hesitation flag.
+    # Use the incrementally built transcript capped at the last 4k chars
+    # (roughly the last half-dozen turns), prefixed by the rolling summary of
+    # earlier turns so late turns keep context at constant prompt size.
+    history_summary = session.get("history_summary", "")
+    recent_history = session["transcript_str"][-4000:]
+    if history_summary:
+        history_text = f"(Earlier context, summarized): {history_summary}\n{recent_history}"
+    else:
+        history_text = recent_history
     system_prompt, hesitation_flag = generate_system_prompt(
         role=session["role"],
         level=session["level"],
@@ -341,106 +562,144 @@ async def submit_response(
         {"role": "user", "content": user_text}
     ]
 
-    # 5) Call LLM to produce 2-line evaluation + follow-up
-    full_response = ""
-    evaluation = ""
-    followup_question = None
-    new_question = None
-    confidence_score = 0.0
-    offtopic = False
+    # Confidence scoring only needs the retrieval results, not the LLM
+    # output — start it now so it runs while the model streams
+    confidence_task = asyncio.create_task(
+        asyncio.to_thread(compute_confidence_score, user_text, session_id, jd_chunk_ids, user_vec)
+    )
 
-    try:
-        full_response = call_openai_llm(messages)
-    except Exception as e:
-        print("OpenAI error during response generation:", e)
-        followup_question = choose_fallback_followup()
-        evaluation = "Short evaluation not available due to model error."
-        full_response = f"{evaluation}\n{followup_question}"
-
-    # 6) Parse LLM output into evaluation + followup
-    if full_response:
-        eval_line, follow_line = parse_llm_two_line_response(full_response)
-        evaluation = eval_line or ""
-        followup_question = follow_line or ""
+    async def event_gen():
+        # 5) Stream LLM tokens to the client while accumulating the full response
+        full_response = ""
+        evaluation = ""
+        followup_question = None
+        new_question = None
+        confidence_score = 0.0
+        offtopic = False
+
+        llm_called = False
+        if cached_payload is not None:
+            # Semantic cache hit: replay the cached turn without an OpenAI call.
+            # Stream only the evaluation — the follow-up arrives in the final
+            # frame, same as the live path.
+            evaluation, followup_question = cached_payload
+            full_response = f"{evaluation}\n{followup_question}"
+            if evaluation:
+                yield sse_frame({"type": "token", "content": evaluation})
+        else:
+            llm_called = True
+            try:
+                # Two short fields of output: anything past 200 tokens is waste
+                token_stream = await call_openai_llm(
+                    messages, stream=True, max_tokens=200,
+                    response_format={"type": "json_object"}
+                )
+                async for delta in token_stream:
+                    full_response += delta
+                    yield sse_frame({"type": "token", "content": delta})
+            except Exception as e:
+                print("OpenAI error during response generation:", e)
+                llm_called = False
+                followup_question = choose_fallback_followup()
+                evaluation = "Short evaluation not available due to model error."
+                full_response = f"{evaluation}\n{followup_question}"
+
+        # 6) Parse structured LLM output into evaluation + followup + offtopic.
+        # Cached and fallback turns already carry exact fields — re-parsing
+        # their joined text would mangle multi-line evaluations.
+        if llm_called and full_response:
+            evaluation, followup_question, offtopic = parse_llm_json_response(full_response)
         new_question = followup_question  # by default present the followup as next question
 
-    # 7) Compute confidence score
-    try:
-        confidence_score = compute_confidence_score(user_text, session_id, jd_chunks)
-    except Exception as e:
-        print("Confidence computation error:", e)
-        confidence_score = 0.0
+        # Clean rendering for history/transcript (full_response may be raw JSON)
+        interviewer_text = f"{evaluation}\n{followup_question}".strip()
 
-    # 8) Detect off-topic by prefix token [OFFTOPIC] in evaluation
-    if evaluation.strip().startswith("[OFFTOPIC]"):
-        offtopic = True
-        # remove marker for display
-        evaluation = evaluation.replace("[OFFTOPIC]", "").strip()
-
-    # 9) Update session state: if not off-topic, increment question count
-    if not offtopic:
-        session["history"].append({"speaker": "Interviewer", "text": full_response})
-        session["questions_asked"] = session.get("questions_asked", 0) + 1
-        session["current_question"] = new_question
-        SESSIONS[session_id] = session
-    else:
-        # Off-topic: keep the history entry so it is traceable but do NOT increment
-        session["history"].append({"speaker": "Interviewer", "text": full_response})
-        # still update current question to model's follow-up (which will likely request re-answer or redirect)
-        session["current_question"] = new_question
-        SESSIONS[session_id] = session
-
-    # 10) Determine max questions for this session
-    max_q = compute_max_questions(session.get("mode", ""))
-
-    # 11) If we've reached or exceeded the limit, generate final feedback and mark finished
-    if session["questions_asked"] >= max_q:
-        print(f"Session {session_id} reached max questions ({session['questions_asked']} >= {max_q}). Generating final feedback.")
-        session["status"] = "finished"
-        # Generate feedback synchronously (could be moved to background task)
-        feedback_text = generate_feedback_for_session(session)
-        session["feedback"] = feedback_text
-        SESSIONS[session_id] = session
-
-        return JSONResponse(content={
+        # 7) Collect the confidence score computed alongside the LLM stream
+        try:
+            confidence_score = await confidence_task
+        except Exception as e:
+            print("Confidence computation error:", e)
+            confidence_score = 0.0
+
+        # 8) Cache fresh on-topic turns only (never redirects or fallbacks)
+        if llm_called and not offtopic and cache_vec is not None and followup_question:
+            await asyncio.to_thread(semantic_cache_store, session_id, cache_vec, evaluation, followup_question)
+
+        # 9) Persist the turn under the session lock: re-read the latest state
+        # so concurrent submissions can't interleave read-modify-write of
+        # history / questions_asked, then append both turns and save.
+        async with get_session_lock(session_id):
+            latest = await session_store.get(session_id) or session
+            latest["history"].append({"speaker": "User", "text": user_text})
+            latest["history"].append({"speaker": "Interviewer", "text": interviewer_text})
+            latest["transcript_str"] = (
+                latest.get("transcript_str", "")
+                + f"\n(User): {user_text}\n(Interviewer): {interviewer_text}"
+            )
+            if not offtopic:
+                latest["questions_asked"] = latest.get("questions_asked", 0) + 1
+            # Off-topic answers keep the history entry (traceable) but do NOT
+            # increment; either way present the model's follow-up next
+            latest["current_question"] = new_question
+            await session_store.save(session_id, latest)
+        session.update(latest)
+
+        # 9b) Every 5 questions, refresh the condensed earlier-context summary
+        # in the background so the next turns' prompts stay small
+        if not offtopic and session.get("questions_asked", 0) % 5 == 0:
+            asyncio.create_task(_refresh_history_summary(session_id, session))
+
+        # 10) Determine max questions for this session
+        max_q = compute_max_questions(session.get("mode", ""))
+
+        # 11) If we've reached or exceeded the limit, generate final feedback and mark finished
+        if session["questions_asked"] >= max_q:
+            print(f"Session {session_id} reached max questions ({session['questions_asked']} >= {max_q}). Generating final feedback.")
+            session["status"] = "finished"
+            async with get_session_lock(session_id):
+                latest = await session_store.get(session_id) or session
+                latest["status"] = "finished"
+                await session_store.save(session_id, latest)
+
+            # Generate feedback in the background; the feedback page polls
+            # /get_feedback, so the user isn't blocked on this round-trip
+            asyncio.create_task(_gen_and_store_feedback(session_id, session))
+
+            yield sse_frame({
+                "type": "final",
+                "user_text": user_text,
+                "evaluation": evaluation,
+                "followup_question": followup_question,
+                "new_question": None,
+                "full_response": full_response,
+                "current_q_count": session["questions_asked"],
+                "feedback_ready": True,
+                "feedback": None,
+                "confidence": confidence_score,
+                "offtopic": offtopic,
+                "hesitation_flag": hesitation_flag
+            })
+            return
+
+        # 12) The follow-up question is spoken client-side by interview.js
+        # (window.speechSynthesis), so the server just returns the text.
+
+        # 13) Final frame (still in-progress)
+        yield sse_frame({
+            "type": "final",
             "user_text": user_text,
             "evaluation": evaluation,
             "followup_question": followup_question,
-            "new_question": None,
+            "new_question": new_question,
             "full_response": full_response,
-            "current_q_count": session["questions_asked"],
-            "feedback_ready": True,
-            "feedback": feedback_text,
+            "current_q_count": session.get("questions_asked", 0),
+            "feedback_ready": False,
             "confidence": confidence_score,
             "offtopic": offtopic,
             "hesitation_flag": hesitation_flag
         })
 
-    # 12) Speak the follow-up question (non-blocking) - speak only the question text (not evaluation)
-    if new_question:
-        def speak_q(q):
-            try:
-                engine.say(q)
-                engine.runAndWait()
-            except Exception:
-                pass
-        threading.Thread(target=speak_q, args=(new_question,), daemon=True).start()
-
-    # 13) Normal response (still in-progress)
-    resp_payload = {
-        "user_text": user_text,
-        "evaluation": evaluation,
-        "followup_question": followup_question,
-        "new_question": new_question,
-        "full_response": full_response,
-        "current_q_count": session.get("questions_asked", 0),
-        "feedback_ready": False,
-        "confidence": confidence_score,
-        "offtopic": offtopic,
-        "hesitation_flag": hesitation_flag
-    }
-
-    return JSONResponse(content=resp_payload)
+    return StreamingResponse(event_gen(), media_type="text/event-stream")
 
 
 # ----------------------------
@@ -454,22 +713,24 @@ async def end_interview(session_id: str = Body(..., embed=True)):
     """
     print("DEBUG: /end_interview CALLED for session", session_id)
 
-    if session_id not in SESSIONS:
+    session = await session_store.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Interview session not found.")
-    session = SESSIONS[session_id]
 
     if session.get("status") == "finished" and session.get("feedback"):
         return JSONResponse(content={"status": "finished", "message": "Feedback already generated.", "session_id": session_id})
 
-    # Mark finished
+    # Mark finished, then generate feedback in the background — the feedback
+    # page polls /get_feedback until it lands
     session["status"] = "finished"
+    async with get_session_lock(session_id):
+        latest = await session_store.get(session_id) or session
+        latest["status"] = "finished"
+        await session_store.save(session_id, latest)
 
-    # Generate feedback (synchronously here; you can make this async/background)
-    feedback_text = generate_feedback_for_session(session)
-    session["feedback"] = feedback_text
-    SESSIONS[session_id] = session
+    asyncio.create_task(_gen_and_store_feedback(session_id, session))
 
-    return JSONResponse(content={"status": "finished", "message": "Feedback generated.", "session_id": session_id, "feedback": feedback_text})
+    return JSONResponse(content={"status": "finished", "message": "Feedback generation started.", "session_id": session_id})
 
 
 # ----------------------------
@@ -477,13 +738,13 @@ async def end_interview(session_id: str = Body(..., embed=True)):
 # ----------------------------
 @app.get("/get_feedback/{session_id}")
 async def get_feedback(session_id: str):
-    if session_id not in SESSIONS:
+    session = await session_store.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Not found.")
-    session = SESSIONS[session_id]
     fb = session.get("feedback")
     if not fb:
-        return JSONResponse(content={"feedback": "Generating... Please check back."})
-    return JSONResponse(content={"feedback": fb})
+        return JSONResponse(content={"feedback": "Generating... Please check back.", "ready": False})
+    return JSONResponse(content={"feedback": fb, "ready": True})
 
 
 # ----------------------------
@@ -8,7 +8,7 @@ Features:
 - Dynamic system prompt generation using retrieved JD context + form inputs.
 - Hesitation detection (ASR text heuristics).
 - Optional semantic similarity confidence score (0..1).
-- Parse LLM 2-line outputs (evaluation + exactly one follow-up).
+- Parse LLM JSON outputs (evaluation + offtopic flag + exactly one follow-up).
 - Minimal, stable API so existing backend flow requires few changes.
 
 Important usage notes:
@@ -16,14 +16,20 @@ Important usage notes:
 - Call build_rag_index(session_id, jd_text) at start_session.
 - On each submit_response, call query_rag(session_id, user_text, top_k)
   and pass returned jd_chunks + rest to generate_system_prompt(...).
-- The LLM is expected to follow the strict 2-line output format. If it
-  marks an answer as off-topic, instruct it to prefix Line 1 with [OFFTOPIC].
+- The LLM is expected to return a strict JSON object (evaluation /
+  offtopic / followup); parse it with parse_llm_json_response, which still
+  falls back to the legacy two-line format with the [OFFTOPIC] marker.
 """
 
 from typing import List, Tuple, Dict, Optional
+from functools import lru_cache
+from collections import OrderedDict
+import hashlib
+import json
 import os
 import re
 import math
+import threading
 import uuid
 import numpy as np
 import faiss
@@ -47,6 +53,13 @@ client = OpenAI(api_key=OPENAI_API_KEY)
 # --- In-memory RAG store (session_id -> { index, chunks, dim })
 RAG_STORE: Dict[str, Dict] = {}
 
+# --- In-memory semantic cache of LLM turns (session_id -> { index, payloads })
+# Keyed by the embedding of "(last_question, user_text)"; a near-duplicate
+# answer to the same question reuses the cached (evaluation, followup) and
+# skips the OpenAI chat call entirely.
+SEMANTIC_CACHE: Dict[str, Dict] = {}
+SEMANTIC_CACHE_THRESHOLD = 0.93
+
 # ----------------------------
 # Utilities: text chunking
 # ----------------------------
@@ -60,29 +73,80 @@ def _chunk_text(text: str, chunk_size_words: int = 150, overlap_words: int = 30)
     words = text.strip().split()
     if len(words) <= chunk_size_words:
         return [" ".join(words)]
-    chunks = []
-    i = 0
-    while i < len(words):
-        chunk = words[i:i + chunk_size_words]
-        chunks.append(" ".join(chunk))
-        i += (chunk_size_words - overlap_words)
-    # filter tiny
-    return [c.strip() for c in chunks if len(c.split()) > 10]
+    # Single pass: precomputed starts, join once per chunk, filter tiny
+    # windows (< 10 words) by word count instead of re-splitting the string
+    stride = chunk_size_words - overlap_words
+    return [
+        " ".join(words[s:s + chunk_size_words])
+        for s in range(0, len(words), stride)
+        if len(words[s:s + chunk_size_words]) > 10
+    ]
 
 # ----------------------------
 # Embeddings (OpenAI)
 # ----------------------------
+# Per-process LRU of embeddings keyed by SHA1 of the text. Repeated strings
+# ("I don't know", the same JD reused across candidates) skip the API call.
+# Callers run in asyncio.to_thread workers, so guard every mutation — an
+# unsynchronized move_to_end racing popitem can raise KeyError.
+_EMB_CACHE: "OrderedDict[str, List[float]]" = OrderedDict()
+_EMB_CACHE_MAX = 10_000
+_EMB_CACHE_LOCK = threading.Lock()
+
 def _embed_texts(texts: List[str]) -> List[List[float]]:
     """
     Return embeddings list (each is list[float]) using the configured model.
+    Results are cached per process; only texts missing from the cache are
+    sent to OpenAI (as one batched request).
     """
     if not texts:
         return []
-    # Using client.embeddings.create
-    resp = client.embeddings.create(model=EMBEDDING_MODEL, input=texts)
-    embeddings = [item.embedding for item in resp.data]
+    keys = [hashlib.sha1(t.encode("utf-8")).hexdigest() for t in texts]
+    embeddings: List[Optional[List[float]]] = [None] * len(texts)
+    missing_texts = []
+    missing_idx = []
+    with _EMB_CACHE_LOCK:
+        for i, key in enumerate(keys):
+            cached = _EMB_CACHE.get(key)
+            if cached is not None:
+                _EMB_CACHE.move_to_end(key)
+                embeddings[i] = cached
+            else:
+                missing_texts.append(texts[i])
+                missing_idx.append(i)
+
+    if missing_texts:
+        # API call stays outside the lock; only the cache update is guarded
+        resp = client.embeddings.create(model=EMBEDDING_MODEL, input=missing_texts)
+        with _EMB_CACHE_LOCK:
+            for i, item in zip(missing_idx, resp.data):
+                embeddings[i] = item.embedding
+                _EMB_CACHE[keys[i]] = item.embedding
+            # evict oldest entries on overflow
+            while len(_EMB_CACHE) > _EMB_CACHE_MAX:
+                _EMB_CACHE.popitem(last=False)
+
     return embeddings
 
+def embed_query(text: str) -> Optional[np.ndarray]:
+    """
+    Embed a single text and return it as a unit-length float32 1-D array (or
+    None on failure). Callers can pass the result to both query_rag and
+    compute_confidence_score so each turn costs one embedding call; since it
+    is already normalized, similarity is a single dot product downstream.
+    """
+    if not text:
+        return None
+    try:
+        embs = _embed_texts([text])
+    except Exception:
+        return None
+    if not embs:
+        return None
+    vec = np.array(embs, dtype="float32").reshape(1, -1)
+    faiss.normalize_L2(vec)
+    return vec[0]
+
 # ----------------------------
 # Build FAISS index for a session JD
 # ----------------------------
@@ -95,22 +159,39 @@ def build_rag_index(session_id: str, jd_text: str) -> None:
     jd_text = (jd_text or "").strip()
     if not jd_text:
         # store empty placeholder
-        RAG_STORE[session_id] = {"index": None, "chunks": [], "dim": 0}
+        RAG_STORE[session_id] = {"index": None, "chunks": [], "dim": 0, "embeddings": None, "mean_emb": None}
         return
 
     chunks = _chunk_text(jd_text, chunk_size_words=150, overlap_words=30)
     if not chunks:
-        RAG_STORE[session_id] = {"index": None, "chunks": [], "dim": 0}
+        RAG_STORE[session_id] = {"index": None, "chunks": [], "dim": 0, "embeddings": None, "mean_emb": None}
         return
 
     embeddings = _embed_texts(chunks)
     dim = len(embeddings[0])
     arr = np.array(embeddings, dtype="float32")
-
-    index = faiss.IndexFlatL2(dim)
+    # OpenAI embeddings are meant for cosine similarity: L2-normalize once and
+    # use an inner-product index, so search scores are directly cosine scores.
+    faiss.normalize_L2(arr)
+
+    if len(chunks) > 64:
+        # Long pasted JDs: HNSW gives O(log N) retrieval per query; brute
+        # force stays for small indexes where it is both exact and faster.
+        index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = 80
+    else:
+        index = faiss.IndexFlatIP(dim)
     index.add(arr)
 
-    RAG_STORE[session_id] = {"index": index, "chunks": chunks, "dim": dim}
+    # Keep the (normalized) chunk embeddings so later per-turn similarity work
+    # (confidence scoring) can slice them instead of re-embedding via OpenAI.
+    RAG_STORE[session_id] = {
+        "index": index,
+        "chunks": chunks,
+        "dim": dim,
+        "embeddings": arr,
+        "mean_emb": arr.mean(axis=0),
+    }
 
 # Optional helper to build index from a plain text file path
 def build_rag_index_from_file(session_id: str, file_path: str) -> None:
@@ -127,31 +208,84 @@ def build_rag_index_from_file(session_id: str, file_path: str) -> None:
 # ----------------------------
 # Query RAG index
 # ----------------------------
-def query_rag(session_id: str, query: str, top_k: int = 3) -> List[str]:
+def query_rag(session_id: str, query: str, top_k: int = 3,
+              query_emb: Optional[np.ndarray] = None) -> Tuple[List[str], List[int]]:
     """
-    Query the session's FAISS index and return top_k relevant JD chunks.
-    If no index exists, returns [].
+    Query the session's FAISS index and return (top_k relevant JD chunks,
+    their integer chunk ids). The ids let callers reuse the embeddings
+    cached in RAG_STORE (e.g. for confidence scoring) without re-embedding.
+    Pass query_emb (from embed_query) to skip the embedding call here.
+    If no index exists, returns ([], []).
     """
     store = RAG_STORE.get(session_id)
     if not store or not store.get("index"):
-        return []
+        return [], []
     index = store["index"]
     chunks = store["chunks"]
     if not chunks:
-        return []
-
-    q_embs = _embed_texts([query])
-    if not q_embs:
-        return []
-    q_vec = np.array(q_embs, dtype="float32").reshape(1, -1)
+        return [], []
+
+    if query_emb is None:
+        q_embs = _embed_texts([query])
+        if not q_embs:
+            return [], []
+        query_emb = np.array(q_embs[0], dtype="float32")
+    # Copy before normalizing: callers reuse query_emb for confidence scoring
+    q_vec = np.array(query_emb, dtype="float32").reshape(1, -1)
+    faiss.normalize_L2(q_vec)
+    if isinstance(index, faiss.IndexHNSWFlat):
+        index.hnsw.efSearch = 16
     k = min(top_k, len(chunks))
     D, I = index.search(q_vec, k)
-    ids = I[0].tolist()
-    out = []
-    for idx in ids:
+    out_chunks = []
+    out_ids = []
+    for idx in I[0].tolist():
         if idx is not None and 0 <= idx < len(chunks):
-            out.append(chunks[idx])
-    return out
+            out_chunks.append(chunks[idx])
+            out_ids.append(idx)
+    return out_chunks, out_ids
+
+# ----------------------------
+# Semantic cache (per-session) for LLM follow-ups
+# ----------------------------
+def semantic_cache_lookup(session_id: str, key_text: str) -> Tuple[Optional[np.ndarray], Optional[Tuple[str, str]]]:
+    """
+    Embed key_text (once) and probe the session's semantic cache.
+    Returns (key_embedding, payload) where payload is a cached
+    (evaluation, followup) tuple on a hit, else None. The embedding is
+    returned L2-normalized so the caller can store it on a miss without
+    re-embedding.
+    """
+    try:
+        embs = _embed_texts([key_text])
+    except Exception:
+        return None, None
+    if not embs:
+        return None, None
+    key_vec = np.array(embs, dtype="float32").reshape(1, -1)
+    faiss.normalize_L2(key_vec)
+
+    store = SEMANTIC_CACHE.get(session_id)
+    if not store or store["index"].ntotal == 0:
+        return key_vec, None
+    D, I = store["index"].search(key_vec, 1)
+    if D[0][0] >= SEMANTIC_CACHE_THRESHOLD:
+        return key_vec, store["payloads"][int(I[0][0])]
+    return key_vec, None
+
+def semantic_cache_store(session_id: str, key_vec: np.ndarray, evaluation: str, followup: str) -> None:
+    """
+    Add a (evaluation, followup) payload under the given normalized key embedding.
+    """
+    if key_vec is None:
+        return
+    store = SEMANTIC_CACHE.get(session_id)
+    if store is None:
+        index = faiss.IndexFlatIP(key_vec.shape[1])
+        store = {"index": index, "payloads": []}
+        SEMANTIC_CACHE[session_id] = store
+    store["index"].add(key_vec)
+    store["payloads"].append((evaluation, followup))
 
 # ----------------------------
 # Hesitation detection
@@ -163,59 +297,102 @@ _HESITATION_PATTERNS = [
 ]
 _hes_re = re.compile("|".join(_HESITATION_PATTERNS), flags=re.IGNORECASE)
 
+# Literal fillers scanned with Aho-Corasick when pyahocorasick is installed:
+# one linear pass over the text instead of a backtracking regex alternation.
+# The digit-ellipsis shape ("12...") cannot be expressed as a literal, so it
+# keeps its own small regex.
+_HESITATION_LITERALS = [
+    "um", "uh", "umm", "well", "maybe", "i think", "not sure",
+    "kind of", "sort of", "i guess", "perhaps"
+]
+_hes_digits_re = re.compile(r"\b\d+\.\.\.")
+
+try:
+    import ahocorasick
+    _HES_AC = ahocorasick.Automaton()
+    for _lit in _HESITATION_LITERALS:
+        _HES_AC.add_word(_lit, _lit)
+    _HES_AC.make_automaton()
+except ImportError:
+    _HES_AC = None
+
+@lru_cache(maxsize=2048)
 def detect_hesitation(text: str) -> bool:
     """
     Heuristic check for hesitation/filler tokens in transcribed text.
-    Returns True if likely hesitation detected.
+    Returns True if likely hesitation detected. Memoized: the same answer is
+    checked by generate_system_prompt and compute_confidence_score each turn.
     """
     if not text or len(text.strip()) == 0:
         return True  # empty -> treat as hesitation/low-confidence
-    return bool(_hes_re.search(text))
+    if _HES_AC is None:
+        return bool(_hes_re.search(text))
+    lower = text.lower()
+    for end_idx, literal in _HES_AC.iter(lower):
+        # Aho-Corasick matches substrings ("um" in "summer"), so re-check the
+        # word boundaries the old regex enforced with \b
+        start = end_idx - len(literal) + 1
+        before = lower[start - 1] if start > 0 else " "
+        after = lower[end_idx + 1] if end_idx + 1 < len(lower) else " "
+        if not before.isalnum() and not after.isalnum():
+            return True
+    return bool(_hes_digits_re.search(lower))
 
 # ----------------------------
 # Simple semantic similarity confidence
 # ----------------------------
-def _mean_embedding_of_chunks(chunks: List[str]) -> Optional[np.ndarray]:
-    if not chunks:
+def _mean_embedding_of_chunks(session_id: str, chunk_indices: List[int]) -> Optional[np.ndarray]:
+    """
+    Unit-length mean embedding of the given JD chunks, sliced from the
+    embeddings cached at build_rag_index time — no OpenAI call. Returning it
+    normalized means cosine against another unit vector is one dot product.
+    """
+    if not chunk_indices:
         return None
-    emb = _embed_texts(chunks)
-    if not emb:
+    store = RAG_STORE.get(session_id)
+    if not store or store.get("embeddings") is None:
         return None
-    arr = np.array(emb, dtype="float32")
-    return np.mean(arr, axis=0)
-
-def _cosine_sim(a: np.ndarray, b: np.ndarray) -> float:
-    if a is None or b is None:
-        return 0.0
-    denom = (np.linalg.norm(a) * np.linalg.norm(b))
-    if denom == 0:
-        return 0.0
-    return float(np.dot(a, b) / denom)
+    arr = store["embeddings"]
+    valid = [i for i in chunk_indices if 0 <= i < arr.shape[0]]
+    if not valid:
+        return None
+    mean = arr[valid].mean(axis=0).reshape(1, -1)
+    faiss.normalize_L2(mean)
+    return mean[0]
 
-def compute_confidence_score(user_text: str, session_id: str, jd_chunks: List[str]) -> float:
+def compute_confidence_score(user_text: str, session_id: str, jd_chunk_ids: List[int],
+                             user_emb: Optional[np.ndarray] = None) -> float:
     """
     Returns confidence in [0,1] that the user's answer is JD-relevant and detailed.
     Computation:
       - semantic similarity between user_text embedding and mean JD chunks embedding (0..1)
       - penalties for hesitation / very short answer
+    jd_chunk_ids are the chunk ids returned by query_rag; their embeddings are
+    read from the RAG_STORE cache rather than re-embedded. Pass user_emb (from
+    embed_query) to reuse the embedding already computed for retrieval.
     """
     if not user_text:
         return 0.0
-    # embeddings
-    try:
-        user_emb = _embed_texts([user_text])[0]
-    except Exception:
-        # if embedding fails, fallback heuristic
-        user_emb = None
-
-    mean_jd_emb = _mean_embedding_of_chunks(jd_chunks) if jd_chunks else None
-    sim = _cosine_sim(np.array(user_emb) if user_emb is not None else None, mean_jd_emb) if user_emb is not None else 0.0
-
-    # normalize sim from [-1,1] to [0,1]
-    sim_norm = max(0.0, min(1.0, (sim + 1) / 2))
-
-    # base confidence is sim_norm
-    conf = sim_norm
+    # embeddings (only if the caller did not already embed user_text)
+    if user_emb is None:
+        try:
+            user_emb = _embed_texts([user_text])[0]
+        except Exception:
+            # if embedding fails, fallback heuristic
+            user_emb = None
+
+    mean_jd_emb = _mean_embedding_of_chunks(session_id, jd_chunk_ids) if jd_chunk_ids else None
+    if user_emb is None or mean_jd_emb is None:
+        sim = 0.0
+    else:
+        # both vectors are unit length, so one BLAS dot gives cosine directly
+        user_vec = np.array(user_emb, dtype="float32").reshape(1, -1)
+        faiss.normalize_L2(user_vec)
+        sim = float(user_vec[0] @ mean_jd_emb)
+
+    # cosine of related text already sits in ~[0,1]; clamp negatives to 0
+    # rather than remapping [-1,1] -> [0,1], which compressed the score range
+    conf = max(0.0, min(1.0, sim))
 
     # penalty for hesitation
     if detect_hesitation(user_text):
@@ -241,9 +418,10 @@ Job Description (relevant excerpts):
 {jd_context}
 
 Interview instructions (MUST follow exactly):
-- OUTPUT MUST BE EXACTLY 2 LINES:
-  Line 1: Short evaluation (1-2 sentences). If the candidate's answer is unrelated to the JD context, prefix Line 1 with the token: [OFFTOPIC]
-  Line 2: EXACTLY ONE follow-up question (one sentence) that is directly tied to the candidate's last answer and the JD context.
+- OUTPUT MUST BE A SINGLE JSON OBJECT with exactly these keys:
+  "evaluation": short evaluation of the candidate's last answer (1-2 sentences).
+  "offtopic": true if the candidate's answer is unrelated to the JD context, otherwise false.
+  "followup": EXACTLY ONE follow-up question (one sentence) that is directly tied to the candidate's last answer and the JD context.
 
 - If HESITATION_FLAG is True: The evaluation should briefly acknowledge hesitation (one short sentence),
   and the follow-up should encourage clarity and ask for a specific detail.
@@ -255,7 +433,7 @@ Interview instructions (MUST follow exactly):
 Interview History:
 {history}
 
-Now produce only the two-line interviewer response.
+Now produce only the JSON interviewer response.
 """
 
 def generate_system_prompt(role: str,
@@ -315,6 +493,38 @@ def parse_llm_two_line_response(text: str) -> Tuple[str, str]:
         follow = lines[1] if len(lines) > 1 else ""
     return eval_line, follow
 
+# ----------------------------
+# Parse structured JSON output
+# ----------------------------
+def parse_llm_json_response(text: str) -> Tuple[str, str, bool]:
+    """
+    Parse the model's JSON object into (evaluation, followup, offtopic).
+    Falls back to the legacy two-line parser (with the [OFFTOPIC] prefix
+    convention) when the payload is not valid JSON, so older outputs and
+    fallback strings still parse.
+    """
+    if not text:
+        return "", "", False
+    try:
+        data = json.loads(text)
+    except (json.JSONDecodeError, ValueError):
+        data = None
+    if isinstance(data, dict):
+        evaluation = str(data.get("evaluation") or "").strip()
+        followup = str(data.get("followup") or "").strip()
+        offtopic = bool(data.get("offtopic", False))
+        return evaluation, followup, offtopic
+    if text.lstrip().startswith("{"):
+        # JSON-mode output that still failed to parse is a truncated fragment
+        # (max_tokens cut the completion off); never surface it as text
+        return "", "", False
+    # Legacy fallback: two-line format, off-topic marked inline
+    evaluation, followup = parse_llm_two_line_response(text)
+    offtopic = evaluation.strip().startswith("[OFFTOPIC]")
+    if offtopic:
+        evaluation = evaluation.replace("[OFFTOPIC]", "").strip()
+    return evaluation, followup, offtopic
+
 # ----------------------------
 # Fallback follow-up
 # ----------------------------
@@ -347,12 +557,17 @@ def build_transcript(session_history: List[Dict]) -> str:
 __all__ = [
     "build_rag_index",
     "build_rag_index_from_file",
+    "embed_query",
     "query_rag",
     "generate_system_prompt",
     "detect_hesitation",
     "compute_confidence_score",
     "parse_llm_two_line_response",
+    "parse_llm_json_response",
     "choose_fallback_followup",
     "build_transcript",
-    "RAG_STORE"
+    "semantic_cache_lookup",
+    "semantic_cache_store",
+    "RAG_STORE",
+    "SEMANTIC_CACHE"
 ]
@@ -162,6 +162,74 @@ function escapeHtml(unsafe) {
       .replace(/>/g, "&gt;");
 }
 
+// =============================
+// SSE STREAM CONSUMPTION
+// =============================
+function extractStreamedEvaluation(buffer) {
+    // The model streams a JSON object; surface the partial "evaluation"
+    // value as it grows. Non-JSON buffers (fallback text) display as-is.
+    const m = buffer.match(/"evaluation"\s*:\s*"((?:[^"\\]|\\.)*)/);
+    if (!m) return buffer.trimStart().startsWith("{") ? "" : buffer;
+    try {
+        return JSON.parse('"' + m[1] + '"');
+    } catch (e) {
+        return m[1];
+    }
+}
+
+async function consumeAnswerStream(res) {
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let streamedText = "";
+    let finalData = null;
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let idx;
+        while ((idx = buffer.indexOf("\n\n")) !== -1) {
+            const frame = buffer.slice(0, idx).trim();
+            buffer = buffer.slice(idx + 2);
+            if (!frame.startsWith("data:")) continue;
+
+            let payload;
+            try {
+                payload = JSON.parse(frame.slice(5).trim());
+            } catch (e) {
+                continue;
+            }
+
+            if (payload.type === "token") {
+                // Render partial evaluation text as tokens arrive
+                streamedText += payload.content;
+                const visible = extractStreamedEvaluation(streamedText);
+                if (visible) showInterviewerNote(visible);
+            } else if (payload.type === "final") {
+                finalData = payload;
+            }
+        }
+    }
+    if (!finalData) throw new Error("Stream ended without a final frame.");
+    return finalData;
+}
+
+function syncCurrentQuestion(newQuestion) {
+    // The SSE passthrough bypasses Django's session update, so report the
+    // new question back — otherwise a page reload shows the stale one.
+    if (!newQuestion) return;
+    fetch("/update_question/", {
+        method: "POST",
+        headers: {
+            "Content-Type": "application/json",
+            "X-CSRFToken": getCookie("csrftoken")
+        },
+        body: JSON.stringify({ new_question: newQuestion })
+    }).catch(err => console.warn("Question sync failed:", err));
+}
+
 // =============================
 // SUBMIT ANSWER LOGIC
 // =============================
@@ -185,7 +253,14 @@ async function handleFormSubmit(event) {
     let data;
     try {
         const res = await fetch("/submit_answer/", { method: "POST", body: fd });
-        data = await res.json();
+        const contentType = res.headers.get("Content-Type") || "";
+        if (contentType.includes("text/event-stream") && res.body) {
+            // Backend streams SSE frames: token frames as the LLM generates,
+            // then one final frame with the full structured payload.
+            data = await consumeAnswerStream(res);
+        } else {
+            data = await res.json();
+        }
     } catch (e) {
         questionP.innerHTML = `<span style="color:red">Error: ${e.message}</span>`;
         submitBtn.disabled = false;
@@ -201,6 +276,9 @@ async function handleFormSubmit(event) {
         return;
     }
 
+    // Keep Django's session in step with the streamed result
+    syncCurrentQuestion(data.new_question);
+
     // Show evaluation if present
     if (data.evaluation) {
         showInterviewerNote(data.evaluation);
@@ -2,7 +2,7 @@ import base64
 import requests
 from django.shortcuts import render, redirect
 from django.views.decorators.csrf import csrf_exempt
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 import json
 import re # Import the regular expression module
 
@@ -134,26 +134,36 @@ def submit_answer(request):
             return JsonResponse({"error": "Invalid base64 audio data."}, status=400)
 
         # 2. Send the audio file and session_id to FastAPI /submit_response
+        # FastAPI streams the LLM output back as Server-Sent Events; forward the
+        # stream to the browser untouched so tokens render as they arrive.
         try:
             r = requests.post(
                 f"{FASTAPI_URL}/submit_response",
                 files={"audio": ("answer.webm", audio_data, "audio/webm")},
-                data={"session_id": session_id}
+                data={"session_id": session_id},
+                stream=True
             )
             r.raise_for_status() # Raise exception for bad status codes (4xx or 5xx)
-            
+
+            content_type = r.headers.get("Content-Type", "")
+            if "text/event-stream" in content_type:
+                response = StreamingHttpResponse(
+                    r.iter_content(chunk_size=None),
+                    content_type="text/event-stream"
+                )
+                # Disable proxy buffering so frames reach the browser immediately
+                response["Cache-Control"] = "no-cache"
+                response["X-Accel-Buffering"] = "no"
+                return response
+
+            # Fallback: backend answered with plain JSON (older behaviour)
             fastapi_response_data = None
-            
-            # --- CRITICAL FIX: Attempt to extract and parse JSON ---
             try:
-                # FIRST ATTEMPT: Try to parse it as clean JSON (the correct way)
-                fastapi_response_data = r.json() 
+                fastapi_response_data = r.json()
             except json.JSONDecodeError:
-                # SECOND ATTEMPT: If it fails, use the extraction logic
                 print(f"JSON DECODE FAILED. Attempting extraction from: {r.text[:50]}...")
                 fastapi_response_data = extract_json_from_text(r.text)
-            
-            
+
             if fastapi_response_data is None:
                 # If both attempts failed, return the original error message
                 print(f"JSON EXTRACTION FAILED. LLM output was invalid: {r.text[:200]}...")
@@ -161,11 +171,11 @@ def submit_answer(request):
                     "error": "FastAPI returned an invalid response (not JSON). Check FastAPI console for errors.",
                     "details": r.text[:50] # Send a snippet of the bad response back for debugging
                 }, status=500)
-            
+
             # 4. If JSON is successfully retrieved, update session and return it
             if 'new_question' in fastapi_response_data:
                 request.session["current_question"] = fastapi_response_data['new_question']
-                
+
             return JsonResponse(fastapi_response_data)
 
         except requests.exceptions.RequestException as e:
@@ -173,6 +183,30 @@ def submit_answer(request):
             return JsonResponse({"error": f"Failed to connect to FastAPI /submit_response: {e}"}, status=500)
     
     return JsonResponse({"error": "Invalid method."}, status=405)
+
+
+@csrf_exempt
+def update_question(request):
+    """
+    Called by interview.js once a streamed answer finishes. The SSE
+    passthrough in submit_answer can't touch the session (Django saves it
+    before the stream body is consumed), so the browser posts the final
+    frame's new_question back here to keep page reloads showing the
+    current question.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "Invalid method."}, status=405)
+
+    try:
+        data = json.loads(request.body.decode("utf-8"))
+    except (ValueError, UnicodeDecodeError):
+        return JsonResponse({"error": "Invalid JSON."}, status=400)
+
+    new_question = data.get("new_question")
+    if new_question:
+        request.session["current_question"] = new_question
+
+    return JsonResponse({"status": "ok"})
     # --- END INTERVIEW AND FEEDBACK LOGIC ---
 
 @csrf_exempt
@@ -205,10 +239,15 @@ def end_interview(request):
 
 
 def feedback(request, session_id):
+    generating = False
     try:
         r = requests.get(f"{FASTAPI_URL}/get_feedback/{session_id}")
         r.raise_for_status()
-        raw_feedback = r.json().get("feedback", "")
+        payload = r.json()
+        raw_feedback = payload.get("feedback", "")
+        # FastAPI generates feedback in a background task; until it lands the
+        # template shows a waiting state and auto-refreshes.
+        generating = not payload.get("ready", True)
     except Exception as e:
         raw_feedback = f"Error fetching feedback: {e}"
 
@@ -228,6 +267,7 @@ def feedback(request, session_id):
 
     return render(request, "feedback.html", {
         "blocks": blocks,
-        "session_id": session_id
+        "session_id": session_id,
+        "generating": generating
     })
 
@@ -8,6 +8,7 @@ urlpatterns = [
     path('start_session/', views.start_interview, name='start_interview'),
     path('interview/', views.interview, name='interview'),
     path('submit_answer/', views.submit_answer, name='submit_answer'),
+    path('update_question/', views.update_question, name='update_question'),
     path("feedback/<str:session_id>/", views.feedback, name="feedback"),
     path("end_interview/", views.end_interview, name="end_interview"),
 ]